@@ -1,15 +1,31 @@
+import csv
+import heapq
+import io
 import sys
+from collections.abc import Callable
 from pathlib import Path
 
 # Constants
 # Using Path from pathlib because it is cleaner and easier to work with and is the recommended approach
 INVENTORY_PATH: Path = Path(Path(__file__).parent / "inventory.txt")
+INVENTORY_HEADER: tuple[str, ...] = ("Country", "Code", "Product", "Cost", "Quantity")
+
+# Table header and separators for view_all, built once at import
+TABLE_HEADER = f"| {'Country':<20} | {'Code':<9} | {'Product Name':<25} | {'Cost':<6} | {'Qty':<4} | {'Value':<9} |"
+TABLE_TOP_BORDER = "_" * len(TABLE_HEADER)
+TABLE_DIVIDER = "-" * len(TABLE_HEADER)
 
 
 # Class
 class Shoe:
     """Blueprint for a shoe product."""
 
+    # Fixed set of attributes, so skip the per-instance __dict__
+    __slots__ = ("country", "code", "product", "cost", "quantity", "value", "_str_cache")
+
+    # Table row template, bound once at class level
+    _ROW_FMT = "| {0:<20} | {1:<9} | {2:<25} | {3:>6} | {4:>4} | {5:>9,} |".format
+
     def __init__(self, country: str, code: str, product: str, cost: int, quantity: int):
         """
         Initialise the Shoe class.
@@ -30,17 +46,23 @@ class Shoe:
         self.product = product
         self.cost = cost
         self.quantity = quantity
-
-    @property
-    def value(self):
-        return self.cost * self.quantity
+        # Total stock value, kept up to date by add_quantity since cost never changes
+        self.value = cost * quantity
+        # Rendered table row, cleared whenever the quantity changes
+        self._str_cache: str | None = None
 
     def add_quantity(self, quantity_to_add: int):
         self.quantity += quantity_to_add
+        self.value = self.cost * self.quantity
+        self._str_cache = None
 
     def __str__(self):
         """String representation of the shoe class as a table row."""
-        return f"| {self.country:<20} | {self.code:<9} | {self.product:<25} | {self.cost:>6} | {self.quantity:>4} | {self.value:>9,} |"
+        if self._str_cache is None:
+            self._str_cache = Shoe._ROW_FMT(
+                self.country, self.code, self.product, self.cost, self.quantity, self.value,
+            )
+        return self._str_cache
 
 
 class Inventory:
@@ -54,46 +76,133 @@ class Inventory:
         :type file_path: Path
         """
         self.file_path = file_path
+        # Check for the file once up front so the methods reading and writing it don't have to
+        if not self.file_path.is_file():
+            self.file_not_found_exit()
         self.shoes: list[Shoe] = []
+        # Index of shoes by SKU code so searching doesn't have to scan the whole list
+        self._by_code: dict[str, Shoe] = {}
+        # Whether the inventory file starts with a header row, set by load_data and save_data
+        self._has_header = False
+        # Heaps of (quantity, position in self.shoes) so the lowest/highest stock can be peeked without a full scan.
+        # The position breaks ties the same way min()/max() would, first shoe in the list wins.
+        # Entries go stale when a quantity changes and are discarded lazily when they reach the top.
+        self._min_heap: list[tuple[int, int]] = []
+        self._max_heap: list[tuple[int, int]] = []
+
+    def _add_shoe(self, shoe: Shoe):
+        """Add a shoe to the shoe list, the code index and the quantity heaps."""
+        self.shoes.append(shoe)
+        self._by_code[shoe.code] = shoe
+        self._push_quantity(len(self.shoes) - 1)
+
+    def _restock(self, position: int, quantity_to_add: int):
+        """
+        Add quantity to a shoe and keep the quantity heaps up to date.
 
-    def load_data(self):
-        has_formatting_errors = False
+        Always restock through here rather than calling Shoe.add_quantity directly,
+        otherwise the shoe's heap entries go stale and it drops out of the heaps.
 
-        try:
-            with Path.open(self.file_path) as inv_file:
-                # Using readline() to skip the header and at the same time get the number of columns in the file
-                num_of_inv_columns = len(inv_file.readline().split(","))
-                for item in inv_file:
-                    item_list = item.strip("\n").split(",")
+        :param position: Index of the shoe in the shoe list
+        :type position: int
+        :param quantity_to_add: Amount of shoes to add
+        :type quantity_to_add: int
+        """
+        self.shoes[position].add_quantity(quantity_to_add)
+        self._push_quantity(position)
 
-                    # Skip if not enough columns of data to avoid error,
-                    # then at the end of function let the user know
-                    if len(item_list) != num_of_inv_columns:
-                        has_formatting_errors = True
-                        continue
+    def _push_quantity(self, position: int):
+        """Push the current quantity of the shoe at position onto the min and max heaps."""
+        quantity = self.shoes[position].quantity
+        heapq.heappush(self._min_heap, (quantity, position))
+        heapq.heappush(self._max_heap, (-quantity, position))
 
-                    shoe = Shoe(
-                        country=item_list[0],
-                        code=item_list[1],
-                        product=item_list[2],
-                        cost=int(item_list[3]),
-                        quantity=int(item_list[4]),
-                    )
-                    self.shoes.append(shoe)
-        except FileNotFoundError:
-            self.file_not_found_exit()
+    def _peek_quantity(self, heap: list[tuple[int, int]], sign: int) -> int | None:
+        """
+        Return the shoe list position at the top of a quantity heap, dropping stale entries on the way.
+
+        :param heap: Either the min heap or the max heap
+        :type heap: list[tuple[int, int]]
+        :param sign: 1 for the min heap, -1 for the max heap where quantities are negated
+        :type sign: int
+        """
+        while heap:
+            quantity, position = heap[0]
+            if self.shoes[position].quantity * sign == quantity:
+                return position
+            heapq.heappop(heap)
+        return None
+
+    def load_data(self):
+        has_formatting_errors = False
+
+        # Read the whole file in one go and parse it in memory rather than iterating the file object.
+        # newline="" is what the csv module expects so quoted fields keep their line breaks
+        with Path.open(self.file_path, newline="") as inv_file:
+            text = inv_file.read()
+
+        reader = csv.reader(io.StringIO(text, newline=""))
+        # Using next() to skip the header and at the same time get the number of columns in the file
+        header = next(reader, None)
+        self._has_header = header is not None
+        num_of_inv_columns = len(header or [])
+        for item_list in reader:
+            # Skip if not enough columns of data to avoid error,
+            # then at the end of function let the user know
+            if len(item_list) != num_of_inv_columns:
+                has_formatting_errors = True
+                continue
+
+            shoe = Shoe(
+                country=item_list[0],
+                code=item_list[1],
+                product=item_list[2],
+                cost=int(item_list[3]),
+                quantity=int(item_list[4]),
+            )
+            self._add_shoe(shoe)
 
         if has_formatting_errors:
             print("\n!!! Check inventory file for incorrect formatting !!!\n")
 
     def save_data(self):
         """Save current shoes list to a file."""
-        with Path.open(self.file_path, "w") as inv_file:
-            inv_file.write("Country,Code,Product,Cost,Quantity\n")
-            for shoe in self.shoes:
-                inv_file.write(
-                    f"{shoe.country},{shoe.code},{shoe.product},{shoe.cost},{shoe.quantity}\n",
-                )
+        # Format every row into an in-memory buffer first so the file gets a single write call
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(INVENTORY_HEADER)
+        writer.writerows(
+            (shoe.country, shoe.code, shoe.product, shoe.cost, shoe.quantity) for shoe in self.shoes
+        )
+        with Path.open(self.file_path, "w", newline="") as inv_file:
+            inv_file.write(buffer.getvalue())
+        self._has_header = True
+
+    def _append_row(self, shoe: Shoe):
+        """
+        Append a single shoe to the end of the inventory file.
+
+        :param shoe: Shoe object to write to the file
+        :type shoe: Shoe
+        """
+        with Path.open(self.file_path, "rb") as inv_file:
+            file_size = inv_file.seek(0, io.SEEK_END)
+            if file_size:
+                inv_file.seek(-1, io.SEEK_END)
+            last_byte = inv_file.read(1)
+
+        # With no header in the file a plain append would leave the new shoe being read as the header next time,
+        # so write out the whole file instead
+        if not self._has_header or not file_size:
+            self.save_data()
+            return
+
+        with Path.open(self.file_path, "a", newline="") as inv_file:
+            # A hand edited file may be missing the final newline, so the new row doesn't get joined onto the last one
+            if last_byte != b"\n":
+                inv_file.write("\n")
+            writer = csv.writer(inv_file, lineterminator="\n")
+            writer.writerow((shoe.country, shoe.code, shoe.product, shoe.cost, shoe.quantity))
 
     def view_all(self):
         """
@@ -101,14 +210,11 @@ class Inventory:
 
         Relying on the string representation of the Shoe object.
         """
-        header = f"| {'Country':<20} | {'Code':<9} | {'Product Name':<25} | {'Cost':<6} | {'Qty':<4} | {'Value':<9} |"
-        table_width = len(header)
-        print("_" * table_width)
-        print(header)
-        print("-" * table_width)
-        for shoe in self.shoes:
-            print(shoe)
-        print("-" * table_width)
+        # Build the whole table first so it goes to stdout in one write
+        lines = [TABLE_TOP_BORDER, TABLE_HEADER, TABLE_DIVIDER]
+        lines.extend(str(shoe) for shoe in self.shoes)
+        lines.append(TABLE_DIVIDER)
+        sys.stdout.write("\n".join(lines) + "\n")
 
     def capture_shoes(self):
         """Ask the user for 5 inputs; country, code, product, cost, and quantity to add a Shoe object to the shoe list."""
@@ -138,8 +244,8 @@ class Inventory:
             )
             # This loop is logic to give the user a chance to redo the details if any entered details are incorrect
             while True:
-                user_input = input("Are these shoe details correct? (y/n): ")
-                if user_input.lower() == "y":
+                choice = input("Are these shoe details correct? (y/n): ").strip().lower()
+                if choice == "y":
                     shoe = Shoe(
                         country=country,
                         code=code,
@@ -147,17 +253,17 @@ class Inventory:
                         cost=cost,
                         quantity=quantity,
                     )
-                    self.shoes.append(shoe)
+                    self._add_shoe(shoe)
 
-                    # Append shoe to the inventory file
-                    self.save_data()
+                    # Append shoe to the inventory file, no need to rewrite the existing rows
+                    self._append_row(shoe)
 
                     print(
                         f"\nNew product: {product} with code {code} entered into inventory\n"
                         "Inventory file updated...",
                     )
                     return
-                if user_input.lower() == "n":
+                if choice == "n":
                     break
                 print("Try again...\n")
 
@@ -167,28 +273,25 @@ class Inventory:
 
         Updates the inventory file.
         """
-        lowest_quantity_product = min(
-            self.shoes,
-            key=lambda shoe: shoe.quantity,
-            default=None,
-        )
-        if not lowest_quantity_product:
+        lowest_quantity_position = self._peek_quantity(self._min_heap, 1)
+        if lowest_quantity_position is None:
             self.file_not_found_exit()
+        lowest_quantity_product = self.shoes[lowest_quantity_position]
 
         print(
             f"The shoe product with the lowest quantity in stock is...\n{lowest_quantity_product}\n",
         )
 
         while True:
-            user_input = input("Would you like to add quantity? (y/n): ")
-            if user_input.lower() == "y":
+            choice = input("Would you like to add quantity? (y/n): ").strip().lower()
+            if choice == "y":
                 try:
                     quantity_to_add = int(input("How much would you like to add: "))
-                    lowest_quantity_product.add_quantity(quantity_to_add)
+                    self._restock(lowest_quantity_position, quantity_to_add)
                     break
                 except ValueError:
                     print("Enter a number value for the restock. Try again...\n")
-            elif user_input.lower() == "n":
+            elif choice == "n":
                 break
             else:
                 print("Try again...\n")
@@ -211,12 +314,8 @@ class Inventory:
                 )
                 user_input = input("Code: SKU")
                 user_input = f"SKU{user_input}"
-                shoe_found = False
-                target_shoe = None
-                for shoe in self.shoes:
-                    if user_input == shoe.code:
-                        shoe_found = True
-                        target_shoe = shoe
+                target_shoe = self._by_code.get(user_input)
+                shoe_found = target_shoe is not None
                 if shoe_found:
                     print("Search result:")
                     print(target_shoe)
@@ -226,23 +325,20 @@ class Inventory:
 
             while True:
                 # Logic to ask if the user wants to search again
-                user_input = input("\nWould you like to search again? (y/n): ")
-                if user_input.lower() == "y":
+                choice = input("\nWould you like to search again? (y/n): ").strip().lower()
+                if choice == "y":
                     break
-                if user_input.lower() == "n":
+                if choice == "n":
                     return
                 print("Try again...\n")
 
     def highest_qty(self):
         """View the highest quantity shoe in the inventory."""
         print("Shoe with the highest quantity in stock...")
-        highest_quantity_product = max(
-            self.shoes,
-            key=lambda shoe: shoe.quantity,
-            default=None,
-        )
-        if not highest_quantity_product:
+        highest_quantity_position = self._peek_quantity(self._max_heap, -1)
+        if highest_quantity_position is None:
             self.file_not_found_exit()
+        highest_quantity_product = self.shoes[highest_quantity_position]
 
         print(highest_quantity_product)
         print(f"\n{highest_quantity_product.product} is now for sale!")
@@ -266,6 +362,26 @@ MENU_INPUT_NEW_SHOE = 3
 MENU_RESTOCK = 4
 MENU_HIGHEST_QUANTITY = 5
 
+MENU_PROMPT = """\nPlease select from the following menu:
+    \t1) View whole inventory
+    \t2) Search for a shoe in inventory using SKU code
+    \t3) Input new shoe detail into inventory
+    \t4) Restock the lowest quantity of a shoe in inventory
+    \t5) View highest quantity of a shoe in inventory
+
+    \t0) Quit program
+
+    \tEnter selection: """
+
+# Maps each menu number to the Inventory method it runs
+MENU_ACTIONS: dict[int, Callable[[Inventory], None]] = {
+    MENU_VIEW_ALL: Inventory.view_all,
+    MENU_SEARCH: Inventory.search_shoe,
+    MENU_INPUT_NEW_SHOE: Inventory.capture_shoes,
+    MENU_RESTOCK: Inventory.re_stock,
+    MENU_HIGHEST_QUANTITY: Inventory.highest_qty,
+}
+
 
 # ==========Main Menu=============
 def main():
@@ -277,34 +393,14 @@ def main():
     while True:
         while True:
             try:
-                user_choice = int(
-                    input(
-                        """\nPlease select from the following menu:
-    \t1) View whole inventory
-    \t2) Search for a shoe in inventory using SKU code
-    \t3) Input new shoe detail into inventory
-    \t4) Restock the lowest quantity of a shoe in inventory
-    \t5) View highest quantity of a shoe in inventory
-
-    \t0) Quit program
-
-    \tEnter selection: """,
-                    ),
-                )
+                user_choice = int(input(MENU_PROMPT))
                 break
             except ValueError:
                 print("\nEnter a number from the list, please try again...")
 
-        if user_choice == MENU_VIEW_ALL:
-            inventory.view_all()
-        elif user_choice == MENU_SEARCH:
-            inventory.search_shoe()
-        elif user_choice == MENU_INPUT_NEW_SHOE:
-            inventory.capture_shoes()
-        elif user_choice == MENU_RESTOCK:
-            inventory.re_stock()
-        elif user_choice == MENU_HIGHEST_QUANTITY:
-            inventory.highest_qty()
+        action = MENU_ACTIONS.get(user_choice)
+        if action:
+            action(inventory)
         elif user_choice == 0:
             print("\nThank you for using the Shoe Inventory Program!")
             break